@@ -4,23 +4,207 @@ DNS Mapper - Cartographie d'environnement DNS avec rapport PDF automatique
 Usage: python dns_mapper.py <domain>
 """
 
+import asyncio
+import socket
+import struct
+import dns.asyncbackend
+import dns.asyncquery
+import dns.asyncresolver
+import dns.inet
+import dns.message
+import dns.name
+import dns.rcode
+import dns.rdataclass
+import dns.rdatatype
 import dns.resolver
 import dns.reversename
 import sys
+import time
 import dns.exception
 import ipaddress
+from dataclasses import dataclass, field
 from datetime import datetime
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.pdfgen import canvas
+from reportlab.platypus import Paragraph, Spacer, Table, TableStyle
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 
 
+# Styles du rapport, construits une seule fois à l'import au lieu
+# d'être réinstanciés à chaque génération (voire à chaque section)
+_STYLES = getSampleStyleSheet()
+
+_NORMAL_STYLE = _STYLES['Normal']
+_NORMAL_STYLE.fontSize = 9
+
+_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_STYLES['Heading1'],
+    fontSize=22,
+    textColor=colors.HexColor('#1e3a8a'),
+    spaceAfter=20,
+    alignment=TA_CENTER,
+    fontName='Helvetica-Bold'
+)
+_SECTION_STYLE = ParagraphStyle(
+    'Section',
+    parent=_STYLES['Heading2'],
+    fontSize=14,
+    textColor=colors.HexColor('#1e40af'),
+    spaceBefore=15,
+    spaceAfter=10,
+    fontName='Helvetica-Bold',
+    borderWidth=1,
+    borderColor=colors.HexColor('#60a5fa'),
+    borderPadding=5,
+    backColor=colors.HexColor('#eff6ff')
+)
+_DATE_STYLE = ParagraphStyle(
+    'date', parent=_NORMAL_STYLE, alignment=TA_CENTER, fontSize=10)
+_SUB_STYLE = ParagraphStyle(
+    'sub', parent=_NORMAL_STYLE, fontSize=10,
+    textColor=colors.HexColor('#1e40af'), spaceAfter=5)
+
+# Style de tableau partagé par toutes les sections du rapport
+# (construit une seule fois à l'import, réutilisé par chaque Table)
+_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('FONTSIZE', (0, 1), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('TOPPADDING', (0, 1), (-1, -1), 5),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
+])
+
+
+# Sous-domaines courants testés par enumerate_subdomains (tuple
+# immuable construit une fois à l'import, pas à chaque appel)
+_COMMON_SUBDOMAINS = (
+    'www', 'mail', 'webmail', 'smtp', 'pop', 'imap',
+    'ftp', 'api', 'admin', 'blog', 'dev', 'test',
+    'preprod', 'staging', 'prod', 'production',
+    'extranet', 'intranet', 'intra', 'vpn',
+    'remote', 'portal', 'crm', 'erp',
+    'mobile', 'app', 'cdn', 'static',
+    'shop', 'store', 'payment', 'secure'
+)
+
+
+def _strip_dot(s):
+    """
+    Retire le point final d'un nom DNS absolu
+
+    to_text() garantit le point terminal : un simple découpage suffit,
+    sans la machinerie générique de rstrip. Appelé pour chaque
+    enregistrement, donc autant qu'il soit minimal.
+
+    Args:
+        s (str): Nom DNS, avec ou sans point final
+
+    Returns:
+        str: Le nom sans point final
+    """
+    return s[:-1] if s[-1:] == '.' else s
+
+
+# Géométrie de page du rapport (A4, marges de 50 points)
+_PAGE_WIDTH, _PAGE_HEIGHT = A4
+_MARGIN = 50
+_AVAIL_WIDTH = _PAGE_WIDTH - 2 * _MARGIN
+
+
+def _render_pdf(filename, story):
+    """
+    Dessine les flowables directement sur un canvas avec pagination manuelle
+
+    Le contenu du rapport n'est qu'une suite linéaire de titres et de
+    tableaux : un simple curseur vertical avec saut de page quand la
+    place manque suffit, sans payer l'algorithme de flux multi-passes
+    de Platypus (SimpleDocTemplate).
+
+    Args:
+        filename (str): Nom du fichier PDF de sortie
+        story (list): Flowables à dessiner, dans l'ordre
+    """
+    canv = canvas.Canvas(filename, pagesize=A4)
+    top = _PAGE_HEIGHT - _MARGIN
+    y = top
+    queue = list(story)
+    i = 0
+    while i < len(queue):
+        flowable = queue[i]
+        if y < top:
+            y -= flowable.getSpaceBefore()
+        avail = y - _MARGIN
+        _, height = flowable.wrap(_AVAIL_WIDTH, avail)
+        if height > avail:
+            # Tableau trop long pour l'espace restant : on le découpe,
+            # sinon on passe simplement à la page suivante
+            parts = flowable.split(_AVAIL_WIDTH, avail)
+            if len(parts) > 1:
+                queue[i:i + 1] = parts
+                continue
+            canv.showPage()
+            y = top
+            _, height = flowable.wrap(_AVAIL_WIDTH, y - _MARGIN)
+        flowable.drawOn(canv, _MARGIN, y - height)
+        y -= height + flowable.getSpaceAfter()
+        i += 1
+    canv.save()
+
+
+def _make_table(header, rows, col_widths):
+    """
+    Construit un tableau avec le style commun du rapport
+
+    Args:
+        header (list): Ligne d'en-tête du tableau
+        rows (list): Lignes de données
+        col_widths (list): Largeurs des colonnes
+
+    Returns:
+        Table: Le tableau stylé prêt à insérer dans le rapport
+    """
+    t = Table([header] + rows, colWidths=col_widths)
+    t.setStyle(_TABLE_STYLE)
+    return t
+
+
+@dataclass(slots=True)
+class ScanResults:
+    """
+    Résultats typés d'un scan DNS
+
+    L'accès attribut remplace les doubles recherches de clés du dict
+    d'origine, et les slots réduisent l'empreinte mémoire de l'instance.
+    """
+    a: list = field(default_factory=list)
+    mx: list = field(default_factory=list)
+    ns: list = field(default_factory=list)
+    txt: list = field(default_factory=list)
+    ptr: dict = field(default_factory=dict)
+    neighbors: dict = field(default_factory=dict)
+    subdomains: dict = field(default_factory=dict)
+
+
 class DNSMapper:
     """Classe pour cartographier l'environnement DNS d'un domaine"""
 
+    __slots__ = ('domain', 'resolver', 'results',
+                 '_sem', '_cache', '_socket_pool')
+
+    # Durée de cache (secondes) des réponses négatives (NXDOMAIN, NoAnswer)
+    _NEGATIVE_TTL = 60
+
     def __init__(self, domain):
         """
         Initialise le mapper DNS
@@ -29,78 +213,166 @@ class DNSMapper:
             domain (str): Le nom de domaine à analyser
         """
         self.domain = domain
-        self.resolver = dns.resolver.Resolver()
+        self.resolver = dns.asyncresolver.Resolver()
         self.resolver.timeout = 2
-        self.results = {}
-
-    def resolve_a(self):
+        # Budget total par requête : borne dure contre les blocages
+        # asynchrones de dnspython
+        self.resolver.lifetime = 2
+        # EDNS0 avec un buffer de 4096 octets : les grosses réponses
+        # (TXT/SPF, MX) passent en un seul aller-retour UDP au lieu de
+        # déclencher une troncature puis une nouvelle tentative en TCP
+        self.resolver.use_edns(0, 0, 4096)
+        # Limite le nombre de requêtes DNS en vol simultanément :
+        # évite les blocages de dnspython en mode asynchrone et reste
+        # poli envers les résolveurs publics
+        self._sem = asyncio.Semaphore(50)
+        # Cache mémoire {(nom, type): (expiration, rdatas)} respectant le TTL
+        self._cache = {}
+        # Pool de sockets UDP persistants (un socket par requête en vol,
+        # réutilisé entre les requêtes successives au lieu d'être recréé)
+        self._socket_pool = []
+        self.results = ScanResults()
+
+    async def _checkout_udp_socket(self, nameserver):
         """
-        Résout les enregistrements A (IPv4)
+        Prend un socket UDP dans le pool, ou en crée un lié une seule fois
+
+        Args:
+            nameserver (str): Adresse du serveur DNS interrogé
 
         Returns:
-            list: Liste des adresses IP, ou liste vide si erreur
+            dns.asyncbackend.DatagramSocket: Socket prêt à l'emploi
         """
-        try:
-            answers = self.resolver.resolve(self.domain, 'A')
-            ips = [str(rdata) for rdata in answers]
-            self.results['A'] = ips
-            return ips
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.Timeout, dns.exception.DNSException):
-            return []
-
-    def resolve_mx(self):
+        if self._socket_pool:
+            return self._socket_pool.pop()
+        backend = dns.asyncbackend.get_default_backend()
+        af = dns.inet.af_for_address(nameserver)
+        source = ('::', 0, 0, 0) if af == socket.AF_INET6 else ('0.0.0.0', 0)
+        return await backend.make_socket(af, socket.SOCK_DGRAM, 0, source)
+
+    async def _close_sockets(self):
+        """Ferme les sockets UDP du pool (liés à la boucle courante)"""
+        for sock in self._socket_pool:
+            await sock.close()
+        self._socket_pool.clear()
+
+    async def _query_udp(self, name, rtype):
         """
-        Résout les enregistrements MX (serveurs mail)
+        Interroge le serveur DNS via un socket UDP persistant du pool
+
+        dnspython crée et détruit normalement un socket UDP par requête ;
+        réutiliser des sockets liés une seule fois supprime ce coût
+        (syscalls socket/bind/close) sur chaque requête du scan.
+
+        Args:
+            name: Nom DNS à résoudre
+            rtype (str): Type d'enregistrement ('A', 'MX', 'PTR', ...)
 
         Returns:
-            list: Liste des serveurs mail, ou liste vide si erreur
+            dns.resolver.Answer: La réponse du serveur
+
+        Raises:
+            dns.resolver.NXDOMAIN: Si le nom n'existe pas
+            dns.resolver.NoAnswer: Si la réponse ne contient aucun enregistrement
+            dns.exception.DNSException: En cas d'échec de la requête
         """
+        qname = dns.name.from_text(str(name))
+        query = dns.message.make_query(qname, rtype, use_edns=0, payload=4096)
+        nameserver = self.resolver.nameservers[0]
+        sock = await self._checkout_udp_socket(nameserver)
         try:
-            answers = self.resolver.resolve(self.domain, 'MX')
-            mx_servers = [str(rdata.exchange).rstrip('.') for rdata in answers]
-            self.results['MX'] = mx_servers
-            return mx_servers
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.Timeout, dns.exception.DNSException):
-            return []
-
-    def resolve_ns(self):
+            response, _ = await dns.asyncquery.udp_with_fallback(
+                query, nameserver, timeout=self.resolver.lifetime, udp_sock=sock
+            )
+        finally:
+            self._socket_pool.append(sock)
+        if response.rcode() == dns.rcode.NXDOMAIN:
+            raise dns.resolver.NXDOMAIN(qnames=[qname], responses={qname: response})
+        answer = dns.resolver.Answer(qname, dns.rdatatype.from_text(rtype),
+                                     dns.rdataclass.IN, response, nameserver)
+        if answer.rrset is None:
+            raise dns.resolver.NoAnswer(response=response)
+        return answer
+
+    async def _cached_resolve(self, name, rtype):
         """
-        Résout les enregistrements NS (nameservers)
+        Résout (name, rtype) avec un cache mémoire qui respecte le TTL
+
+        Les requêtes répétées (mêmes PTR entre A records et voisins,
+        mêmes sous-domaines entre deux scans) sont servies depuis le
+        cache sans round-trip réseau. Les réponses négatives (NXDOMAIN,
+        NoAnswer) sont aussi mises en cache avec un TTL par défaut.
+
+        Args:
+            name: Nom DNS à résoudre
+            rtype (str): Type d'enregistrement ('A', 'MX', 'PTR', ...)
 
         Returns:
-            list: Liste des nameservers, ou liste vide si erreur
+            list: Liste des rdata de la réponse, ou liste vide si erreur
         """
+        key = (str(name), rtype)
+        cached = self._cache.get(key)
+        if cached is not None:
+            expiry, rdatas = cached
+            if time.monotonic() < expiry:
+                return rdatas
+            del self._cache[key]
+
         try:
-            answers = self.resolver.resolve(self.domain, 'NS')
-            nameservers = [str(rdata.target).rstrip('.') for rdata in answers]
-            self.results['NS'] = nameservers
-            return nameservers
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.Timeout, dns.exception.DNSException):
+            async with self._sem:
+                answers = await self._query_udp(name, rtype)
+            rdatas = list(answers)
+            ttl = answers.rrset.ttl if answers.rrset is not None else self._NEGATIVE_TTL
+            self._cache[key] = (time.monotonic() + ttl, rdatas)
+            return rdatas
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer):
+            self._cache[key] = (time.monotonic() + self._NEGATIVE_TTL, [])
+            return []
+        except (dns.resolver.Timeout, dns.exception.DNSException):
             return []
 
-    def resolve_txt(self):
+    async def _resolve(self, rtype, post=str):
         """
-        Résout les enregistrements TXT
+        Résout un type d'enregistrement du domaine et stocke le résultat
+
+        Les quatre resolve_* publics sont des enveloppes minces autour
+        de cette méthode : une seule implémentation à maintenir (cache,
+        sémaphore, gestion d'erreurs).
+
+        Args:
+            rtype (str): Type d'enregistrement ('A', 'MX', 'NS', 'TXT')
+            post (callable): Conversion appliquée à chaque rdata
 
         Returns:
-            list: Liste des enregistrements TXT, ou liste vide si erreur
+            list: Liste des valeurs converties, ou liste vide si erreur
         """
-        try:
-            answers = self.resolver.resolve(self.domain, 'TXT')
-            txt_records = []
-            for rdata in answers:
-                txt = ''.join([s.decode() if isinstance(s, bytes) else s for s in rdata.strings])
-                txt_records.append(txt)
-            self.results['TXT'] = txt_records
-            return txt_records
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.Timeout, dns.exception.DNSException):
-            return []
-
-    def reverse_dns(self, ip):
+        rdatas = await self._cached_resolve(self.domain, rtype)
+        values = [post(rdata) for rdata in rdatas]
+        setattr(self.results, rtype.lower(), values)
+        return values
+
+    async def resolve_a(self):
+        """Résout les enregistrements A (IPv4)"""
+        return await self._resolve('A')
+
+    async def resolve_mx(self):
+        """Résout les enregistrements MX (serveurs mail)"""
+        return await self._resolve(
+            'MX', lambda rdata: _strip_dot(str(rdata.exchange)))
+
+    async def resolve_ns(self):
+        """Résout les enregistrements NS (nameservers)"""
+        return await self._resolve(
+            'NS', lambda rdata: _strip_dot(str(rdata.target)))
+
+    async def resolve_txt(self):
+        """Résout les enregistrements TXT"""
+        # Les fragments TXT sont toujours des bytes : une seule
+        # concaténation C plutôt qu'un décodage fragment par fragment
+        return await self._resolve(
+            'TXT', lambda rdata: b''.join(rdata.strings).decode('utf-8', 'replace'))
+
+    async def reverse_dns(self, ip):
         """
         Fait un reverse DNS (IP → domaine)
 
@@ -110,17 +382,27 @@ class DNSMapper:
         Returns:
             list: Liste des noms de domaine, ou liste vide si erreur
         """
+        # Pré-filtre : les adresses privées, loopback, link-local ou
+        # multicast n'ont pas de PTR public, inutile d'interroger le réseau
+        try:
+            ip_obj = ipaddress.ip_address(ip)
+        except ValueError:
+            return []
+        if (ip_obj.is_private or ip_obj.is_loopback
+                or ip_obj.is_link_local or ip_obj.is_multicast):
+            return []
+
         try:
             rev_name = dns.reversename.from_address(ip)
-            answers = self.resolver.resolve(rev_name, 'PTR')
-            return [str(rdata).rstrip('.') for rdata in answers]
-        except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                dns.resolver.Timeout, dns.exception.DNSException):
+        except dns.exception.DNSException:
             return []
+        rdatas = await self._cached_resolve(rev_name, 'PTR')
+        return [_strip_dot(str(rdata)) for rdata in rdatas]
 
-    def scan_ip_neighbors(self, ip, range_size=5):
+    async def scan_ip_neighbors(self, ip, range_size=5):
         """
         Scan les adresses IP voisines et fait un reverse DNS
+        (toutes les requêtes PTR en parallèle)
 
         Args:
             ip (str): Adresse IP de base
@@ -131,299 +413,253 @@ class DNSMapper:
         """
         neighbors = {}
         try:
-            ip_obj = ipaddress.IPv4Address(ip)
+            base = struct.unpack('!I', socket.inet_aton(ip))[0]
+        except OSError:
+            return neighbors
+
+        # Arithmétique entière + formatage C : bien plus léger que de
+        # construire un objet IPv4Address par offset
+        neighbor_ips = [
+            socket.inet_ntoa(struct.pack('!I', (base + offset) & 0xffffffff))
+            for offset in range(-range_size, range_size + 1) if offset != 0
+        ]
 
-            for offset in range(-range_size, range_size + 1):
-                if offset == 0:
-                    continue
+        reverses = await asyncio.gather(
+            *(self.reverse_dns(neighbor_ip) for neighbor_ip in neighbor_ips)
+        )
+        for neighbor_ip, reverse in zip(neighbor_ips, reverses):
+            if reverse:
+                neighbors[neighbor_ip] = reverse
 
-                try:
-                    neighbor_ip = str(ip_obj + offset)
-                    reverse = self.reverse_dns(neighbor_ip)
-                    if reverse:
-                        neighbors[neighbor_ip] = reverse
-                except (ipaddress.AddressValueError, ValueError):
-                    continue
+        return neighbors
 
-        except ipaddress.AddressValueError:
-            pass
+    async def _resolve_sub(self, subdomain):
+        """
+        Résout un sous-domaine en enregistrements A
 
-        return neighbors
+        Args:
+            subdomain (str): Le sous-domaine complet à résoudre
+
+        Returns:
+            list: Liste des adresses IP, ou liste vide si erreur
+        """
+        rdatas = await self._cached_resolve(subdomain, 'A')
+        return [str(rdata) for rdata in rdatas]
 
-    def enumerate_subdomains(self):
+    async def _enumerate_subdomains_tcp(self, subdomains):
         """
-        Énumère les sous-domaines courants
+        Pipeline toutes les requêtes de sous-domaines sur une seule
+        connexion TCP (RFC 7766)
+
+        Une seule poignée de main TCP est payée quel que soit le nombre
+        de sous-domaines : toutes les requêtes sont envoyées d'un bloc,
+        puis les réponses sont collectées au fil de l'eau et réassociées
+        par nom de question.
+
+        Args:
+            subdomains (list): Sous-domaines complets à résoudre
 
         Returns:
             dict: Dictionnaire {subdomain: ips}
+
+        Raises:
+            OSError, EOFError, dns.exception.DNSException: Si la connexion
+                échoue ou est fermée avant la fin du pipeline
         """
-        common_subdomains = [
-            'www', 'mail', 'webmail', 'smtp', 'pop', 'imap',
-            'ftp', 'api', 'admin', 'blog', 'dev', 'test',
-            'preprod', 'staging', 'prod', 'production',
-            'extranet', 'intranet', 'intra', 'vpn',
-            'remote', 'portal', 'crm', 'erp',
-            'mobile', 'app', 'cdn', 'static',
-            'shop', 'store', 'payment', 'secure'
-        ]
+        nameserver = self.resolver.nameservers[0]
+        backend = dns.asyncbackend.get_default_backend()
+        af = dns.inet.af_for_address(nameserver)
+        sock = await backend.make_socket(
+            af, socket.SOCK_STREAM, 0, None, (nameserver, 53),
+            self.resolver.lifetime
+        )
 
         found_subdomains = {}
+        try:
+            # Phase d'envoi : toutes les requêtes partent sans attendre
+            # la moindre réponse (pipelining)
+            pending = {}
+            for subdomain in subdomains:
+                qname = dns.name.from_text(subdomain)
+                query = dns.message.make_query(qname, 'A')
+                pending[qname] = subdomain
+                await dns.asyncquery.send_tcp(
+                    sock, query, time.time() + self.resolver.lifetime)
+
+            # Phase de réception : les réponses peuvent arriver dans
+            # n'importe quel ordre, on les réassocie par nom
+            for _ in range(len(subdomains)):
+                response, _ = await dns.asyncquery.receive_tcp(
+                    sock, time.time() + self.resolver.lifetime)
+                if not response.question:
+                    continue
+                qname = response.question[0].name
+                subdomain = pending.pop(qname, None)
+                if subdomain is None or response.rcode() != dns.rcode.NOERROR:
+                    continue
+                try:
+                    answer = dns.resolver.Answer(
+                        qname, dns.rdatatype.A, dns.rdataclass.IN,
+                        response, nameserver)
+                except dns.exception.DNSException:
+                    continue
+                if answer.rrset:
+                    found_subdomains[subdomain] = [str(rdata) for rdata in answer]
+        finally:
+            await sock.close()
+
+        return found_subdomains
+
+    async def enumerate_subdomains(self):
+        """
+        Énumère les sous-domaines courants (toutes les requêtes en parallèle)
 
-        for sub in common_subdomains:
-            subdomain = f"{sub}.{self.domain}"
-            try:
-                answers = self.resolver.resolve(subdomain, 'A')
-                ips = [str(rdata) for rdata in answers]
+        Returns:
+            dict: Dictionnaire {subdomain: ips}
+        """
+        subdomains = [f"{sub}.{self.domain}" for sub in _COMMON_SUBDOMAINS]
+
+        # Une seule connexion TCP pipelinée pour toute la liste ;
+        # repli sur les requêtes UDP concurrentes si elle échoue.
+        # EOFError : le serveur a le droit (RFC 7766) de fermer la
+        # connexion avant d'avoir répondu à tout le pipeline
+        try:
+            return await self._enumerate_subdomains_tcp(subdomains)
+        except (OSError, EOFError, dns.exception.DNSException):
+            pass
+
+        results = await asyncio.gather(
+            *(self._resolve_sub(subdomain) for subdomain in subdomains),
+            return_exceptions=True
+        )
+
+        found_subdomains = {}
+        for subdomain, ips in zip(subdomains, results):
+            if ips and not isinstance(ips, BaseException):
                 found_subdomains[subdomain] = ips
-            except (dns.resolver.NXDOMAIN, dns.resolver.NoAnswer,
-                    dns.resolver.Timeout, dns.exception.DNSException):
-                continue
 
         return found_subdomains
 
-    def generate_pdf(self, filename):
+    async def generate_pdf(self, filename):
         """
         Génère un rapport PDF complet
 
+        La mise en page et la sérialisation du PDF (travail CPU) sont
+        déportées dans un thread pour ne pas bloquer la boucle d'événements.
+
         Args:
             filename (str): Nom du fichier PDF de sortie
         """
-        doc = SimpleDocTemplate(filename, pagesize=A4,
-                                rightMargin=50, leftMargin=50,
-                                topMargin=50, bottomMargin=50)
-
-        # Styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=22,
-            textColor=colors.HexColor('#1e3a8a'),
-            spaceAfter=20,
-            alignment=TA_CENTER,
-            fontName='Helvetica-Bold'
-        )
-        section_style = ParagraphStyle(
-            'Section',
-            parent=styles['Heading2'],
-            fontSize=14,
-            textColor=colors.HexColor('#1e40af'),
-            spaceBefore=15,
-            spaceAfter=10,
-            fontName='Helvetica-Bold',
-            borderWidth=1,
-            borderColor=colors.HexColor('#60a5fa'),
-            borderPadding=5,
-            backColor=colors.HexColor('#eff6ff')
-        )
-        normal_style = styles['Normal']
-        normal_style.fontSize = 9
-
         story = []
 
         # Titre
-        story.append(Paragraph(f"Rapport DNS - {self.domain}", title_style))
+        story.append(Paragraph(f"Rapport DNS - {self.domain}", _TITLE_STYLE))
         story.append(Paragraph(f"Généré le {datetime.now().strftime('%d/%m/%Y à %H:%M:%S')}",
-                               ParagraphStyle('date', parent=normal_style, alignment=TA_CENTER, fontSize=10)))
+                               _DATE_STYLE))
         story.append(Spacer(1, 0.3 * inch))
 
+        # Les sections sans données sont omises entièrement : pas
+        # d'en-tête ni de paragraphe "Aucun ..." à mettre en page
+
         # Section A Records
-        story.append(Paragraph("Adresses IP (A Records)", section_style))
-        if 'A' in self.results and self.results['A']:
-            data = [['Adresse IP', 'Reverse DNS (PTR)']]
-            for ip in self.results['A']:
-                reverse = self.reverse_dns(ip)
-                ptr = Paragraph(reverse[0] if reverse else '-', normal_style)
-                data.append([ip, ptr])
-
-            t = Table(data, colWidths=[1.8 * inch, 4.5 * inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('FONTSIZE', (0, 1), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-            ]))
-            story.append(t)
-        else:
-            story.append(Paragraph("✗ Aucune adresse IP trouvée", normal_style))
-        story.append(Spacer(1, 0.15 * inch))
+        if self.results.a:
+            story.append(Paragraph("Adresses IP (A Records)", _SECTION_STYLE))
+            no_ptr = Paragraph('-', _NORMAL_STYLE)
+            ptr_map = self.results.ptr
+            rows = []
+            for ip in self.results.a:
+                reverse = ptr_map.get(ip, [])
+                ptr = Paragraph(reverse[0], _NORMAL_STYLE) if reverse else no_ptr
+                rows.append([ip, ptr])
+            story.append(_make_table(['Adresse IP', 'Reverse DNS (PTR)'],
+                                     rows, [1.8 * inch, 4.5 * inch]))
+            story.append(Spacer(1, 0.15 * inch))
 
         # Section MX Records
-        story.append(Paragraph(" Serveurs Mail (MX Records)", section_style))
-        if 'MX' in self.results and self.results['MX']:
-            data = [['Serveur Mail']]
-            for mx in self.results['MX']:
-                data.append([Paragraph(mx, normal_style)])
-
-            t = Table(data, colWidths=[6.3 * inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-            ]))
-            story.append(t)
-        else:
-            story.append(Paragraph("✗ Aucun serveur mail trouvé", normal_style))
-        story.append(Spacer(1, 0.15 * inch))
+        if self.results.mx:
+            story.append(Paragraph(" Serveurs Mail (MX Records)", _SECTION_STYLE))
+            rows = [[Paragraph(mx, _NORMAL_STYLE)] for mx in self.results.mx]
+            story.append(_make_table(['Serveur Mail'], rows, [6.3 * inch]))
+            story.append(Spacer(1, 0.15 * inch))
 
         # Section NS Records
-        story.append(Paragraph("Nameservers (NS Records)", section_style))
-        if 'NS' in self.results and self.results['NS']:
-            data = [['Nameserver']]
-            for ns in self.results['NS']:
-                data.append([Paragraph(ns, normal_style)])
-
-            t = Table(data, colWidths=[6.3 * inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-            ]))
-            story.append(t)
-        else:
-            story.append(Paragraph("✗ Aucun nameserver trouvé", normal_style))
-        story.append(Spacer(1, 0.15 * inch))
+        if self.results.ns:
+            story.append(Paragraph("Nameservers (NS Records)", _SECTION_STYLE))
+            rows = [[Paragraph(ns, _NORMAL_STYLE)] for ns in self.results.ns]
+            story.append(_make_table(['Nameserver'], rows, [6.3 * inch]))
+            story.append(Spacer(1, 0.15 * inch))
 
         # Section TXT Records
-        story.append(Paragraph(" Enregistrements TXT", section_style))
-        if 'TXT' in self.results and self.results['TXT']:
-            data = [['Enregistrement TXT']]
-            for txt in self.results['TXT']:
-                data.append([Paragraph(txt, normal_style)])
-
-            t = Table(data, colWidths=[6.3 * inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-            ]))
-            story.append(t)
-        else:
-            story.append(Paragraph("✗  Aucun enregistrement TXT trouvé", normal_style))
-        story.append(Spacer(1, 0.15 * inch))
-
-        # Section IP Neighbors
-        story.append(Paragraph(" Adresses IP Voisines", section_style))
-        if 'neighbors' in self.results and self.results['neighbors']:
-            for base_ip, neighbors in self.results['neighbors'].items():
-                story.append(Paragraph(f"<b>Voisins de {base_ip}:</b>",
-                                       ParagraphStyle('sub', parent=normal_style, fontSize=10,
-                                                      textColor=colors.HexColor('#1e40af'), spaceAfter=5)))
-                if neighbors:
-                    data = [['IP Voisine', 'Domaine']]
-                    for neighbor_ip, domains in neighbors.items():
-                        data.append([neighbor_ip, Paragraph(domains[0], normal_style)])
-
-                    t = Table(data, colWidths=[1.8 * inch, 4.5 * inch])
-                    t.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                        ('FONTSIZE', (0, 0), (-1, 0), 10),
-                        ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                        ('TOPPADDING', (0, 1), (-1, -1), 5),
-                        ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                        ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-                    ]))
-                    story.append(t)
-                    story.append(Spacer(1, 0.1 * inch))
-                else:
-                    story.append(Paragraph("✗ Aucun voisin avec PTR trouvé", normal_style))
-                    story.append(Spacer(1, 0.1 * inch))
-        else:
-            story.append(Paragraph("✗ Aucune IP voisine analysée", normal_style))
-        story.append(Spacer(1, 0.15 * inch))
+        if self.results.txt:
+            story.append(Paragraph(" Enregistrements TXT", _SECTION_STYLE))
+            rows = [[Paragraph(txt, _NORMAL_STYLE)] for txt in self.results.txt]
+            story.append(_make_table(['Enregistrement TXT'], rows, [6.3 * inch]))
+            story.append(Spacer(1, 0.15 * inch))
+
+        # Section IP Neighbors (seules les IPs avec des voisins apparaissent)
+        if any(self.results.neighbors.values()):
+            story.append(Paragraph(" Adresses IP Voisines", _SECTION_STYLE))
+            for base_ip, neighbors in self.results.neighbors.items():
+                if not neighbors:
+                    continue
+                story.append(Paragraph(f"<b>Voisins de {base_ip}:</b>", _SUB_STYLE))
+                rows = [[neighbor_ip, Paragraph(domains[0], _NORMAL_STYLE)]
+                        for neighbor_ip, domains in neighbors.items()]
+                story.append(_make_table(['IP Voisine', 'Domaine'],
+                                         rows, [1.8 * inch, 4.5 * inch]))
+                story.append(Spacer(1, 0.1 * inch))
+            story.append(Spacer(1, 0.05 * inch))
 
         # Section Subdomains
-        story.append(Paragraph("🔗 Sous-domaines", section_style))
-        if 'subdomains' in self.results and self.results['subdomains']:
-            data = [['Sous-domaine', 'Adresses IP']]
-            for subdomain, ips in self.results['subdomains'].items():
-                ip_text = Paragraph(', '.join(ips), normal_style)
-                data.append([Paragraph(subdomain, normal_style), ip_text])
-
-            t = Table(data, colWidths=[3 * inch, 3.3 * inch])
-            t.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e40af')),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-                ('TOPPADDING', (0, 1), (-1, -1), 5),
-                ('BOTTOMPADDING', (0, 1), (-1, -1), 5),
-                ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f0f9ff')]),
-                ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#bfdbfe'))
-            ]))
-            story.append(t)
-        else:
-            story.append(Paragraph("✗ Aucun sous-domaine trouvé", normal_style))
-
-        # Construction du PDF
-        doc.build(story)
+        if self.results.subdomains:
+            story.append(Paragraph("🔗 Sous-domaines", _SECTION_STYLE))
+            rows = [[Paragraph(subdomain, _NORMAL_STYLE),
+                     Paragraph(', '.join(ips), _NORMAL_STYLE)]
+                    for subdomain, ips in self.results.subdomains.items()]
+            story.append(_make_table(['Sous-domaine', 'Adresses IP'],
+                                     rows, [3 * inch, 3.3 * inch]))
+
+        # Construction du PDF dans un thread (CPU-bound)
+        await asyncio.to_thread(_render_pdf, filename, story)
         print(f"✓ Rapport PDF généré: {filename}")
 
-    def scan(self):
+    async def scan(self):
         """Lance le scan complet du domaine (tout activé par défaut)"""
         print(f"Scan DNS en cours pour {self.domain}...")
 
-        # Tous les scans activés
+        # Tous les scans activés, lancés en parallèle (le temps total
+        # correspond à la requête la plus lente, pas à la somme)
         print("  → Résolution A, MX, NS, TXT...")
-        self.resolve_a()
-        self.resolve_mx()
-        self.resolve_ns()
-        self.resolve_txt()
+        await asyncio.gather(
+            self.resolve_a(),
+            self.resolve_mx(),
+            self.resolve_ns(),
+            self.resolve_txt()
+        )
 
         # Scan des voisins pour chaque IP
-        if 'A' in self.results and self.results['A']:
-            print(f"  → Scan des voisins pour {len(self.results['A'])} IP(s)...")
-            self.results['neighbors'] = {}
-            for ip in self.results['A']:
-                neighbors = self.scan_ip_neighbors(ip, range_size=5)
-                self.results['neighbors'][ip] = neighbors
+        if self.results.a:
+            print(f"  → Scan des voisins pour {len(self.results.a)} IP(s)...")
+            # Reverse DNS des IPs principales, réutilisé tel quel par
+            # generate_pdf (aucune requête DNS pendant la génération du PDF)
+            ptrs = await asyncio.gather(
+                *(self.reverse_dns(ip) for ip in self.results.a)
+            )
+            self.results.ptr = dict(zip(self.results.a, ptrs))
+            all_neighbors = await asyncio.gather(
+                *(self.scan_ip_neighbors(ip, range_size=5) for ip in self.results.a)
+            )
+            self.results.neighbors = dict(zip(self.results.a, all_neighbors))
 
         # Énumération des sous-domaines
         print("  → Énumération des sous-domaines (peut prendre quelques secondes)...")
-        subdomains = self.enumerate_subdomains()
-        self.results['subdomains'] = subdomains
+        subdomains = await self.enumerate_subdomains()
+        self.results.subdomains = subdomains
         print(f"  → {len(subdomains)} sous-domaine(s) trouvé(s)")
 
+        # Les sockets du pool sont liés à la boucle d'événements courante
+        await self._close_sockets()
+
         print("✓ Scan terminé!")
 
 
@@ -442,12 +678,15 @@ def main():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     pdf_filename = f"dns_report_{domain}_{timestamp}.pdf"
 
-    # Création du mapper et scan complet
+    # Création du mapper, scan complet puis génération du PDF
+    # dans une seule boucle d'événements
     mapper = DNSMapper(domain)
-    mapper.scan()
 
-    # Génération automatique du PDF
-    mapper.generate_pdf(pdf_filename)
+    async def run():
+        await mapper.scan()
+        await mapper.generate_pdf(pdf_filename)
+
+    asyncio.run(run())
 
 
 if __name__ == '__main__':